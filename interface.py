@@ -1,10 +1,20 @@
 from __future__ import annotations
-from typing import Optional, Any
+from typing import Optional, Any, Callable, Dict, FrozenSet, List, Set, Tuple
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+import hashlib
+import json
+import os
+import queue
+import shelve
 import string
+import sys
 import re
-from urllib.parse import quote
+import time
+from urllib.parse import quote_plus
 
-from recipe_api import parse_recipe_from_url, Recipe, Step
+from recipe_api import parse_recipe_from_url, Recipe, Step, Ingredient
 
 
 try:
@@ -12,31 +22,373 @@ try:
 except ImportError:
     sr = None
 
-EXIT_COMMANDS = ["quit", "exit","end","goodbye","bye"]
-QUIT_MESSAGE = "Bot: Goodbye!"
+try:
+    import numpy as np
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+try:
+    import vosk
+except ImportError:
+    vosk = None
 
+try:
+    import sounddevice as sd
+except ImportError:
+    sd = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+EXIT_COMMANDS = frozenset({"quit", "exit", "q", "end", "goodbye", "bye"})
+INGREDIENT_COMMANDS = frozenset({
+    "1", "ingredients", "ingredient list", "show me the ingredients list",
+    "show ingredients", "go over ingredients", "go over ingredients list",
+})
+STEP_COMMANDS = frozenset({
+    "2", "steps", "go over steps", "start steps",
+    "show steps", "go over recipe steps",
+})
+_SPOKEN_DIGITS = {"one": "1", "two": "2"}
+QUIT_MESSAGE = "Bot: Goodbye!"
+_URL_SCHEMES = ("http://", "https://")
+FALLBACK_MESSAGE = (
+    "I didn't quite catch that.\n"
+    "You can try commands like:\n"
+    "- '1' or 'show me the ingredients list'\n"
+    "- '2' or 'go over steps'\n"
+    "- 'next step', 'go to the next step', 'continue'\n"
+    "- 'go back one step', 'previous step'\n"
+    "- 'repeat that', 'say that again'\n"
+    "- 'How long do I bake it for?'\n"
+    "- 'What temperature should the oven be?'\n"
+    "- 'How many eggs do I need?', 'How much salt do I need?'\n"
+    "- 'What is a whisk?' or 'What is it?'\n"
+    "- 'How do I knead the dough?' or 'How do I do that?'"
+)
+
+_PUNCT_TABLE = str.maketrans("", "", string.punctuation)
+_ASCII_NORM_TABLE = {
+    **_PUNCT_TABLE,
+    **{c: c + 32 for c in range(ord("A"), ord("Z") + 1)},
+}
+
+
+RESPONSE_CACHE_SIZE = 256
+
+WHISPER_MODEL = "tiny.en"
+VOSK_MODEL_PATH = os.environ.get("RECIPEBOT_VOSK_MODEL", "model")
+
+RECIPE_CACHE_PATH = os.environ.get(
+    "RECIPEBOT_CACHE", os.path.join(os.path.expanduser("~"), ".recipebot_cache")
+)
+# Bump whenever build_steps or parse_ingredient_line output changes, or the
+# shelve keeps serving recipes parsed by the old code.
+RECIPE_CACHE_VERSION = 2
+RECIPE_CACHE_SIZE = 64
+_RECIPE_CACHE_INDEX = "__index__"
+
+INTENT_PHRASES: Dict[str, List[str]] = {
+    "NEXT": [
+        "next step", "go to the next step", "go to next step",
+        "next", "continue", "whats next", "what is next"
+    ],
+    "BACK": [
+        "go back one step", "go back a step", "go back",
+        "previous step", "previous", "back"
+    ],
+    "REPEAT": [
+        "repeat please", "repeat that", "say that again", "again", "repeat"
+    ],
+    "FIRST": ["first step", "go to step one", "go to the first step"],
+    "TIME": ["how long", "for how long", "cooking time", "baking time"],
+    "TIME_WORD": ["time"],
+    "COOK_WORD": ["cook", "bake", "simmer"],
+    "TEMP": [
+        "temperature", "temp", "degrees", "what heat", "how hot",
+        "bake at", "baked at", "preheat"
+    ],
+    "QUANTITY": ["how much", "how many", "amount of", "quantity of"],
+    "VAGUE_HOW": ["how do i do that", "how do i do this", "how do i do it"],
+}
+
+TEMP_EXACT = {"what degree"}
+
+
+def _build_intent_automaton():
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for intent, phrases in INTENT_PHRASES.items():
+        for phrase in phrases:
+            automaton.add_word(phrase, (intent, len(phrase)))
+    automaton.make_automaton()
+    return automaton
+
+
+_INTENT_AC = _build_intent_automaton()
+
+def _alternation(phrases: List[str]) -> str:
+    return "|".join(re.escape(p) for p in phrases)
+
+
+_INTENT_RES: Dict[str, re.Pattern] = {
+    intent: re.compile(_alternation(phrases))
+    for intent, phrases in INTENT_PHRASES.items()
+}
+
+def _scan_intents(norm: str) -> FrozenSet[str]:
+    intents: Set[str] = set()
+    if _INTENT_AC is not None:
+        for _, (intent, _) in _INTENT_AC.iter(norm):
+            intents.add(intent)
+    else:
+        for intent, pattern in _INTENT_RES.items():
+            if pattern.search(norm):
+                intents.add(intent)
+
+    if "TIME_WORD" in intents and "COOK_WORD" in intents:
+        intents.add("TIME")
+    if norm in TEMP_EXACT:
+        intents.add("TEMP")
+    return frozenset(intents)
+
+
+_EXACT_INTENTS: Dict[str, FrozenSet[str]] = {
+    phrase: _scan_intents(phrase)
+    for phrases in INTENT_PHRASES.values()
+    for phrase in phrases
+}
+
+
+def _match_intents(norm: str) -> FrozenSet[str]:
+    intents = _EXACT_INTENTS.get(norm)
+    if intents is None:
+        intents = _scan_intents(norm)
+    return intents
+
+
+
+def _is_valid_recipe(recipe: Any) -> bool:
+    return (
+        isinstance(recipe, Recipe)
+        and isinstance(recipe.title, str)
+        and isinstance(recipe.ingredients, list)
+        and isinstance(recipe.steps, list)
+        and all(isinstance(i, Ingredient) for i in recipe.ingredients)
+        and all(isinstance(s, Step) for s in recipe.steps)
+    )
+
+
+def _recipe_cache_index(cache: Any) -> Dict[str, float]:
+    index = cache.get(_RECIPE_CACHE_INDEX)
+    return index if isinstance(index, dict) else {}
+
+
+def _load_recipe_cached(url: str) -> Recipe:
+    key = hashlib.sha256(f"{RECIPE_CACHE_VERSION}:{url}".encode("utf-8")).hexdigest()
+    try:
+        with shelve.open(RECIPE_CACHE_PATH) as cache:
+            cached = cache.get(key)
+            if _is_valid_recipe(cached):
+                index = _recipe_cache_index(cache)
+                index[key] = time.time()
+                cache[_RECIPE_CACHE_INDEX] = index
+                return cached
+    except Exception:
+        pass
+
+    recipe = parse_recipe_from_url(url)
+    try:
+        with shelve.open(RECIPE_CACHE_PATH) as cache:
+            index = _recipe_cache_index(cache)
+            index[key] = time.time()
+            cache[key] = recipe
+            for stale in sorted(index, key=index.get)[:-RECIPE_CACHE_SIZE]:
+                del index[stale]
+            # also drops entries left behind by older cache versions
+            for k in list(cache.keys()):
+                if k not in index and k != _RECIPE_CACHE_INDEX:
+                    del cache[k]
+            cache[_RECIPE_CACHE_INDEX] = index
+    except Exception:
+        pass
+    return recipe
+
+
+@lru_cache(maxsize=128)
+def _search_url(query: str) -> str:
+    return f"https://www.google.com/search?q={quote_plus(query)}"
+
+
+@lru_cache(maxsize=128)
+def _youtube_url(query: str) -> str:
+    return f"https://www.youtube.com/results?search_query={quote_plus(query)}"
 
 
 class RecipeBot:
-    def __init__(self, use_speech: bool = False):
+    def __init__(
+        self,
+        use_speech: bool = False,
+        pause_threshold: float = 0.3,
+        non_speaking_duration: float = 0.2,
+        phrase_threshold: float = 0.15,
+        phrase_time_limit: Optional[float] = 6.0,
+    ):
         self.recipe: Optional[Recipe] = None
         self.current_step_idx: int = 0
         self.use_speech = use_speech and (sr is not None)
         self.recognizer: Optional[Any] = None
+        self.pause_threshold = pause_threshold
+        self.non_speaking_duration = non_speaking_duration
+        self.phrase_threshold = phrase_threshold
+        self.phrase_time_limit = phrase_time_limit
+        self.microphone: Optional[Any] = None
+        self._audio_queue: "queue.Queue[Any]" = queue.Queue()
+        self._stop_listening: Optional[Callable[..., None]] = None
+        self._vosk_stream: Optional[Any] = None
+        self._stt_pool: Optional[ThreadPoolExecutor] = None
+        self._next_utterance: "Optional[Future[Optional[str]]]" = None
+        self.whisper: Optional[Any] = None
+        self.vosk_model: Optional[Any] = None
+        self._vosk_grammar: Optional[str] = None
+        self._ing_patterns: List[Tuple[Ingredient, re.Pattern]] = []
+        self._ingredients_text: str = ""
+        self._ing_names_lower: List[str] = []
+        self._ing_short: Dict[str, str] = {}
+        self._ing_formatted: Dict[int, str] = {}
+        self._ordinals: List[str] = []
+        self._step_strings: List[str] = []
+        self._timed_steps_by_method: Dict[str, List[int]] = {}
+        self._step_durations: Tuple[Optional[str], ...] = ()
+        self._step_temps: Tuple[Optional[Tuple[str, str]], ...] = ()
+        self._step_quantity_answers: List[Optional[str]] = []
+        self._response_cache: "OrderedDict[Tuple[str, int], str]" = OrderedDict()
 
         if use_speech and sr is None:
             print("Bot: speech_recognition is not installed; falling back to text input.")
             self.use_speech = False
         elif use_speech:
-            self.recognizer = sr.Recognizer()
+            self._init_speech()
+
+    def _init_speech(self) -> None:
+        self.recognizer = sr.Recognizer()
+        self.recognizer.pause_threshold = self.pause_threshold
+        self.recognizer.non_speaking_duration = self.non_speaking_duration
+        self.recognizer.phrase_threshold = self.phrase_threshold
+        self._audio_queue = queue.Queue()
+        if vosk is not None and os.path.isdir(VOSK_MODEL_PATH):
+            if self.vosk_model is None:
+                self.vosk_model = vosk.Model(VOSK_MODEL_PATH)
+        elif WhisperModel is not None and self.whisper is None:
+            self.whisper = WhisperModel(WHISPER_MODEL, compute_type="int8")
+
+        if self.vosk_model is not None and sd is not None:
+            # 20 ms blocks go straight to vosk, so decoding keeps pace with speech.
+            self._vosk_stream = sd.RawInputStream(
+                samplerate=16000,
+                blocksize=320,
+                dtype="int16",
+                channels=1,
+                callback=lambda data, frames, time, status: self._audio_queue.put(bytes(data)),
+            )
+            self._vosk_stream.start()
+            self._stop_listening = self._stop_vosk_stream
+        else:
+            self.microphone = sr.Microphone()
+            with self.microphone as source:
+                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+            # Keep the calibrated threshold instead of re-estimating it every phrase.
+            self.recognizer.dynamic_energy_threshold = False
+            self._stop_listening = self.recognizer.listen_in_background(
+                self.microphone,
+                lambda _, audio: self._audio_queue.put(audio),
+                phrase_time_limit=self.phrase_time_limit,
+            )
+        self._stt_pool = ThreadPoolExecutor(max_workers=1)
+        self._next_utterance = self._stt_pool.submit(self._capture_and_recognize)
+
+    def _stop_vosk_stream(self, wait_for_stop: bool = False) -> None:
+        if self._vosk_stream is not None:
+            self._vosk_stream.stop()
+            self._vosk_stream.close()
+        self._vosk_stream = None
+
+    def _capture_and_recognize(self) -> Optional[str]:
+        if self._vosk_stream is not None:
+            return self._recognize_vosk_stream()
+        audio = self._audio_queue.get()
+        if audio is None:
+            return None
+        return self.transcribe(audio)
+
+    def _new_vosk_recognizer(self) -> Any:
+        if self._vosk_grammar:
+            return vosk.KaldiRecognizer(self.vosk_model, 16000, self._vosk_grammar)
+        return vosk.KaldiRecognizer(self.vosk_model, 16000)
 
     @staticmethod
-    def normalize(text: str) -> str:
-        text = text.lower()
-        text = text.translate(str.maketrans("", "", string.punctuation))
-        text = " ".join(text.split())
+    def _vosk_text(result: str) -> str:
+        text = json.loads(result).get("text", "")
+        return " ".join(w for w in text.split() if w != "[unk]")
+
+    def _recognize_vosk_stream(self) -> Optional[str]:
+        grammar = self._vosk_grammar
+        rec = self._new_vosk_recognizer()
+        while True:
+            chunk = self._audio_queue.get()
+            if chunk is None:
+                return None
+            # the recipe grammar may arrive after this utterance started listening
+            if self._vosk_grammar != grammar:
+                grammar = self._vosk_grammar
+                rec = self._new_vosk_recognizer()
+            if rec.AcceptWaveform(chunk):
+                text = self._vosk_text(rec.Result())
+                if text:
+                    return text
+
+    def close(self) -> None:
+        if self._stop_listening is not None:
+            self._stop_listening(wait_for_stop=False)
+        self._stop_listening = None
+        self.microphone = None
+        if self._stt_pool is not None:
+            if self._next_utterance is not None:
+                self._next_utterance.cancel()
+            self._audio_queue.put(None)
+            self._stt_pool.shutdown(wait=False)
+        self._stt_pool = None
+        self._next_utterance = None
+
+    def transcribe(self, audio: Any) -> str:
+        if self.vosk_model is None and self.whisper is None:
+            return self.recognizer.recognize_google(audio)
+
+        pcm = audio.get_raw_data(convert_rate=16000, convert_width=2)
+        if self.vosk_model is not None:
+            rec = self._new_vosk_recognizer()
+            rec.AcceptWaveform(pcm)
+            text = self._vosk_text(rec.FinalResult())
+        else:
+            samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+            segments, _ = self.whisper.transcribe(samples, beam_size=1)
+            text = " ".join(seg.text.strip() for seg in segments).strip()
+        if not text:
+            raise sr.UnknownValueError()
         return text
 
+    @staticmethod
+    def normalize(text: str) -> str:
+        if text.isascii():
+            text = text.translate(_ASCII_NORM_TABLE)
+        else:
+            text = text.lower().translate(_PUNCT_TABLE)
+        return " ".join(text.split())
+
 
 
 
@@ -49,21 +401,26 @@ class RecipeBot:
 
         print("Bot: Please paste or say a recipe URL to get started.")
 
-        while True:
-            user = self.get_user_input()
-            if user is None:
-                continue
-
-            if not user:
-                continue
-
-            norm = self.normalize(user)
-            if norm in EXIT_COMMANDS:
-                print(QUIT_MESSAGE)
-                break
-
-            response = self.handle_input(user)
-            print(f"Bot: {response}")
+        try:
+            while True:
+                user = self.get_user_input()
+                if user is None:
+                    continue
+
+                if not user:
+                    continue
+
+                norm = self.normalize(user)
+                if norm in EXIT_COMMANDS:
+                    print(QUIT_MESSAGE)
+                    break
+
+                response = self.handle_input(user, norm)
+                sys.stdout.write(f"Bot: {response}\n")
+                if self.use_speech:
+                    sys.stdout.flush()
+        finally:
+            self.close()
 
     def get_user_input(self) -> Optional[str]:
         if not self.use_speech:
@@ -73,16 +430,18 @@ class RecipeBot:
                 print(f"\n{QUIT_MESSAGE}")
                 return "quit"
 
-        if self.recognizer is None:
-            self.recognizer = sr.Recognizer()
+        if self.recognizer is None or self._stop_listening is None:
+            self._init_speech()
 
         try:
-            with sr.Microphone() as source:
-                print("User (speak): ", end="", flush=True)
-                audio = self.recognizer.listen(source)
-
+            print("User (speak): ", end="", flush=True)
             try:
-                text = self.recognizer.recognize_google(audio)
+                try:
+                    text = self._next_utterance.result()
+                finally:
+                    self._next_utterance = self._stt_pool.submit(self._capture_and_recognize)
+                if text is None:
+                    return None
                 print(text)
                 return text.strip()
             except sr.UnknownValueError:
@@ -92,161 +451,86 @@ class RecipeBot:
                 print(f"\nBot: STT service error ({e}). Falling back to keyboard input.")
                 self.use_speech = False
                 self.recognizer = None
+                self.close()
                 return input("User: ").strip()
         except KeyboardInterrupt:
             print(f"\n{QUIT_MESSAGE}")
             return "quit"
 
-    def handle_input(self, user: str) -> str:
+    @classmethod
+    def _tokenize(cls, user: str, norm: Optional[str] = None) -> Tuple[str, str, bool]:
         raw = user.strip()
-        norm = self.normalize(raw)
+        if norm is None:
+            norm = cls.normalize(raw)
+        return raw, norm, raw[:1] == "h" and raw.startswith(_URL_SCHEMES)
+
+    def handle_input(self, user: str, norm: Optional[str] = None) -> str:
+        raw, norm, is_url = self._tokenize(user, norm)
 
-        if raw.startswith("http"):
+        if is_url:
             return self.load_recipe(raw)
 
         if self.recipe is None:
             if "allrecipes" in norm:
-                url = raw
-                if not url.startswith("http"):
-                    url = "https://" + url
-                return self.load_recipe(url)
+                return self.load_recipe("https://" + raw)
             return "Please paste or say an AllRecipes.com URL first."
 
-        if norm in [
-            "1", "ingredients", "ingredient list", "show me the ingredients list",
-            "show ingredients", "go over ingredients", "go over ingredients list"
-        ]:
-            return self.show_ingredients()
-
-        if norm in [
-            "2", "steps", "go over steps", "start steps",
-            "show steps", "go over recipe steps"
-        ]:
-            self.current_step_idx = 0
-            return self.show_current_step()
-
-        if self.is_next_command(norm):
-            return self.next_step()
+        command = _COMMAND_HANDLERS.get(_SPOKEN_DIGITS.get(norm, norm))
+        if command is not None:
+            return command(self)
 
-        if self.is_back_command(norm):
-            return self.prev_step()
+        intents = _match_intents(norm)
 
-        if self.is_repeat_command(norm):
-            return self.show_current_step()
+        for intent, handler in _NAVIGATION_HANDLERS.items():
+            if intent in intents:
+                return handler(self)
 
-        
-        if "first step" in norm or "go to step one" in norm or "go to the first step" in norm:
-            self.current_step_idx = 0
-            return self.show_current_step()
+        key = (norm, self.current_step_idx)
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            self._response_cache.move_to_end(key)
+            return cached
 
+        response = self.answer_question(raw, norm, intents)
+        self._response_cache[key] = response
+        if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+        return response
 
-        if self.is_time_question(norm):
-            return self.answer_time_question()
+    def answer_question(self, raw: str, norm: str, intents: FrozenSet[str]) -> str:
+        for intent, handler in _QUESTION_HANDLERS.items():
+            if intent in intents:
+                return handler(self, raw, norm)
 
-        if self.is_temp_question(norm):
-            return self.answer_temp_question()
+        m = _QUERY_RE.match(norm)
+        if m:
+            return _QUERY_HANDLERS[m.group("prefix")](self, m.group("query"))
 
-        if self.is_quantity_question(norm):
-            return self.answer_quantity_question(raw)
-
-        if (
-            "how do i do that" in norm
-            or "how do i do this" in norm
-            or "how do i do it" in norm
-        ):
-            return self.answer_vague_how_to()
-        
-        
-        if norm.startswith("what is "):
-            return self.answer_what_is(norm)
-        
-        if norm.startswith("how do i "):
-            query = norm[len("how do i "):].strip()
-            return f"https://www.youtube.com/results?search_query=how+to+{quote(query)}"
-        
-        if norm.startswith("how to "):
-            query = norm[len("how to "):].strip()
-            return f"https://www.youtube.com/results?search_query=how+to+{quote(query)}"
-        
-        return (
-            "I didn't quite catch that.\n"
-            "You can try commands like:\n"
-            "- '1' or 'show me the ingredients list'\n"
-            "- '2' or 'go over steps'\n"
-            "- 'next step', 'go to the next step', 'continue'\n"
-            "- 'go back one step', 'previous step'\n"
-            "- 'repeat that', 'say that again'\n"
-            "- 'How long do I bake it for?'\n"
-            "- 'What temperature should the oven be?'\n"
-            "- 'How many eggs do I need?', 'How much salt do I need?'\n"
-            "- 'What is a whisk?' or 'What is it?'\n"
-            "- 'How do I knead the dough?' or 'How do I do that?'"
-        )
+        return FALLBACK_MESSAGE
 
     @staticmethod
     def is_next_command(norm: str) -> bool:
-        patterns = [
-            "next step", "go to the next step", "go to next step",
-            "next", "continue", "whats next", "what is next"
-        ]
-        return any(p in norm for p in patterns)
+        return "NEXT" in _match_intents(norm)
 
     @staticmethod
     def is_back_command(norm: str) -> bool:
-        patterns = [
-            "go back one step", "go back a step", "go back",
-            "previous step", "previous", "back"
-        ]
-        return any(p in norm for p in patterns)
+        return "BACK" in _match_intents(norm)
 
     @staticmethod
     def is_repeat_command(norm: str) -> bool:
-        patterns = [
-            "repeat please", "repeat that", "say that again", "again", "repeat"
-        ]
-        return any(p in norm for p in patterns)
+        return "REPEAT" in _match_intents(norm)
 
     @staticmethod
     def is_time_question(norm: str) -> bool:
-        if "how long" in norm or "for how long" in norm:
-            return True
-        if "cooking time" in norm or "baking time" in norm:
-            return True
-        if "time" in norm and ("cook" in norm or "bake" in norm or "simmer" in norm):
-            return True
-        return False
-
+        return "TIME" in _match_intents(norm)
 
     @staticmethod
     def is_temp_question(norm: str) -> bool:
-        if norm in {
-            "temp", "temperature",
-            "what temp", "what temperature",
-            "what degree", "what degrees",
-            "what heat"
-        }:
-            return True
-        
-        if "temperature" in norm or "temp" in norm or "degrees" in norm:
-            return True
-        if "what heat" in norm or "how hot" in norm:
-            return True
-        if "bake at" in norm or "baked at" in norm:
-            return True
-        if "preheat" in norm and ("to" in norm or "at" in norm):
-            return True
-
-        return False
-
-
+        return "TEMP" in _match_intents(norm)
 
     @staticmethod
     def is_quantity_question(norm: str) -> bool:
-        if "how much" in norm or "how many" in norm:
-            return True
-        if "amount of" in norm or "quantity of" in norm:
-            return True
-        return False
+        return "QUANTITY" in _match_intents(norm)
 
     @staticmethod
     def format_ingredient(ing) -> str:
@@ -261,11 +545,18 @@ class RecipeBot:
             return "Please provide a valid URL."
 
         # Basic URL validation
-        if not (url.startswith("http://") or url.startswith("https://")):
+        if not url.startswith(_URL_SCHEMES):
             return "Please provide a valid URL starting with http:// or https://"
 
         try:
-            self.recipe = parse_recipe_from_url(url)
+            recipe = _load_recipe_cached(url)
+            try:
+                self._index_recipe(recipe)
+            except Exception:
+                if self.recipe is not None:
+                    self._index_recipe(self.recipe)
+                raise
+            self.recipe = recipe
             self.current_step_idx = 0
             return (
                 f"Alright. So let's start working with \"{self.recipe.title}\".\n"
@@ -278,13 +569,76 @@ class RecipeBot:
         except Exception as e:
             return f"Something went wrong loading that recipe: {e}"
 
+    def _index_recipe(self, recipe: Recipe) -> None:
+        self._response_cache.clear()
+        self._ing_patterns = []
+        patterns: Dict[str, re.Pattern] = {}
+        ing_lines = [f'Here are the ingredients for "{recipe.title}":']
+        self._ing_names_lower = []
+        self._ing_short = {}
+        self._ing_formatted = {}
+        for ing in recipe.ingredients:
+            short = self.format_ingredient(ing)
+            self._ing_formatted[id(ing)] = short
+            ing_lines.append(f"- {short}")
+            name = ing.name.lower()
+            self._ing_names_lower.append(name)
+            if name:
+                if name not in patterns:
+                    patterns[name] = re.compile(r"\b" + re.escape(name) + r"\b")
+                self._ing_patterns.append((ing, patterns[name]))
+                self._ing_short.setdefault(name, short)
+        self._ingredients_text = "\n".join(ing_lines)
+
+        self._ordinals = [self.ordinal(s.step_number) for s in recipe.steps]
+        self._step_strings = [
+            f"The {o} step is: {s.description}"
+            for o, s in zip(self._ordinals, recipe.steps)
+        ]
+
+        self._step_quantity_answers = []
+        for s in recipe.steps:
+            lines = [
+                f"- {self._ing_short[name]}"
+                for name in s.ingredients
+                if name in self._ing_short
+            ]
+            if len(lines) == 1:
+                answer = f"For that, you need {lines[0][2:]}."
+            elif lines:
+                answer = "For this step, the relevant quantities are:\n" + "\n".join(lines)
+            else:
+                answer = None
+            self._step_quantity_answers.append(answer)
+
+        vocab = set(EXIT_COMMANDS)
+        for phrases in INTENT_PHRASES.values():
+            vocab.update(phrases)
+        vocab.update(c for c in INGREDIENT_COMMANDS | STEP_COMMANDS if not c.isdigit())
+        vocab.update(_QUERY_HANDLERS)
+        vocab.update(_SPOKEN_DIGITS)
+        for name in patterns:
+            vocab.update(name.split())
+        vocab.update(recipe.tools)
+        vocab.update(recipe.methods)
+        self._vosk_grammar = json.dumps(sorted(vocab) + ["[unk]"])
+
+        self._step_durations = tuple(
+            s.time.get("duration") or None for s in recipe.steps
+        )
+        self._step_temps = tuple(
+            next(iter(s.temperature.items()), None) for s in recipe.steps
+        )
+        self._timed_steps_by_method = defaultdict(list)
+        for i, s in enumerate(recipe.steps):
+            if self._step_durations[i]:
+                for m in set(s.methods):
+                    self._timed_steps_by_method[m].append(i)
+
     def show_ingredients(self) -> str:
         if self.recipe is None:
             return "No recipe loaded. Please load a recipe first."
-        lines = [f'Here are the ingredients for "{self.recipe.title}":']
-        for ing in self.recipe.ingredients:
-            lines.append(f"- {self.format_ingredient(ing)}")
-        return "\n".join(lines)
+        return self._ingredients_text
 
     def get_current_step(self) -> Step:
         if self.recipe is None:
@@ -295,13 +649,21 @@ class RecipeBot:
             raise ValueError(f"Step index {self.current_step_idx} out of range.")
         return self.recipe.steps[self.current_step_idx]
 
+    def current_step_or_none(self) -> Optional[Step]:
+        if self.recipe is None or self.current_step_idx >= len(self.recipe.steps):
+            return None
+        return self.recipe.steps[self.current_step_idx]
+
     def show_current_step(self) -> str:
         try:
-            step = self.get_current_step()
-            ordinal = self.ordinal(step.step_number)
-            return f"The {ordinal} step is: {step.description}"
+            self.get_current_step()
         except ValueError as e:
             return str(e)
+        return self._step_strings[self.current_step_idx]
+
+    def first_step(self) -> str:
+        self.current_step_idx = 0
+        return self.show_current_step()
 
     def next_step(self) -> str:
         if self.recipe is None:
@@ -335,22 +697,26 @@ class RecipeBot:
         except ValueError as e:
             return str(e)
 
-        if step.time.get("duration"):
-            return f"In this step, the time is {step.time['duration']}."
+        duration = self._step_durations[self.current_step_idx]
+        if duration:
+            return f"In this step, the time is {duration}."
 
-        verbs = set(step.methods)
-        for s in self.recipe.steps:
-            if s.time.get("duration"):
-                if verbs & set(s.methods):
-                    return (
-                        f"For {', '.join(verbs)} earlier, "
-                        f"the recipe says: {s.time['duration']}."
-                    )
+        candidates = [
+            self._timed_steps_by_method[m][0]
+            for m in step.methods
+            if m in self._timed_steps_by_method
+        ]
+        if candidates:
+            verbs = dict.fromkeys(step.methods)
+            return (
+                f"For {', '.join(verbs)} earlier, "
+                f"the recipe says: {self._step_durations[min(candidates)]}."
+            )
 
 
-        for s in self.recipe.steps:
-            if s.time.get("duration"):
-                return f"Earlier, the recipe says: {s.time['duration']}."
+        for duration in self._step_durations:
+            if duration:
+                return f"Earlier, the recipe says: {duration}."
         return "The recipe does not specify a clear time here."
 
 
@@ -365,8 +731,9 @@ class RecipeBot:
         except ValueError as e:
             return str(e)
 
-        if step.temperature:
-            key, value = next(iter(step.temperature.items()))
+        temp = self._step_temps[self.current_step_idx]
+        if temp:
+            key, value = temp
             
             if key == "oven":
                 return f"In this step, the oven should be at {value}."
@@ -377,9 +744,9 @@ class RecipeBot:
             return f"The temperature should be {step.context['oven_temperature']}."
 
 
-        for s in self.recipe.steps:
-            if s.temperature:
-                key, value = next(iter(s.temperature.items()))
+        for temp in self._step_temps:
+            if temp:
+                key, value = temp
                 if key == "oven":
                     return f"The recipe uses an oven temperature of {value}."
                 else:
@@ -400,26 +767,21 @@ class RecipeBot:
             return phrase if phrase else None
         return None
 
-    def answer_quantity_question(self, user: str) -> str:
+    def answer_quantity_question(self, raw: str, norm: str) -> str:
         if self.recipe is None:
             return "No recipe loaded. Please load a recipe first."
-        norm = self.normalize(user)
 
         mentioned = []
 
-        for ing in self.recipe.ingredients:
-            name = ing.name.lower()
-            if not name:
-                continue
-            if re.search(r"\b" + re.escape(name) + r"\b", norm):
+        for ing, pattern in self._ing_patterns:
+            if pattern.search(norm):
                 mentioned.append(ing)
 
         if not mentioned:
             target_phrase = self._extract_quantity_target_phrase(norm)
             if target_phrase:
                 target_tokens = [t for t in target_phrase.split() if t]
-                for ing in self.recipe.ingredients:
-                    name_low = ing.name.lower()
+                for ing, name_low in zip(self.recipe.ingredients, self._ing_names_lower):
                     if not name_low:
                         continue
                     for tok in target_tokens:
@@ -431,31 +793,23 @@ class RecipeBot:
                             break
 
         if mentioned:
-            lines = [f"- {self.format_ingredient(ing)}" for ing in mentioned]
+            lines = [f"- {self._ing_formatted[id(ing)]}" for ing in mentioned]
             if len(lines) == 1:
                 return f"You need {lines[0][2:]}."
             else:
                 return "Here are the quantities:\n" + "\n".join(lines)
 
-        
-        step = self.get_current_step()
-        if step.ingredients:
-            lines = []
-            for name in step.ingredients:
-                for ing in self.recipe.ingredients:
-                    if ing.name.lower() == name:
-                        lines.append(f"- {self.format_ingredient(ing)}")
-                        break
-            if lines:
-                if len(lines) == 1:
-                    return f"For that, you need {lines[0][2:]}."
-                else:
-                    return "For this step, the relevant quantities are:\n" + "\n".join(lines)
+        if self.current_step_or_none() is not None:
+            answer = self._step_quantity_answers[self.current_step_idx]
+            if answer:
+                return answer
 
         return "I'm not sure which ingredient you mean."
 
     def answer_vague_how_to(self) -> str:
-        step = self.get_current_step()
+        step = self.current_step_or_none()
+        if step is None:
+            return "I'm not sure what 'that' refers to in this step."
 
         verb: Optional[str] = None
         if step.action:
@@ -469,46 +823,78 @@ class RecipeBot:
 
         if verb and obj:
             query = f"how to {verb} {obj}"
-            return f"https://www.youtube.com/results?search_query={quote(query)}"
+            return _youtube_url(query)
 
         if verb:
             query = f"how to {verb}"
-            return f"https://www.youtube.com/results?search_query={quote(query)}"
+            return _youtube_url(query)
 
         if obj:
             query = f"how to use {obj}"
-            return f"https://www.youtube.com/results?search_query={quote(query)}"
+            return _youtube_url(query)
 
         return "I'm not sure what 'that' refers to in this step."
 
-    def answer_what_is(self, norm: str) -> str:
-        body = norm[len("what is "):].strip()
+    def answer_how_to(self, query: str) -> str:
+        return _youtube_url(f"how to {query}")
+
+    def answer_what_is(self, body: str) -> str:
+        if self.recipe is None or (body and body not in {"it", "that", "this"}):
+            return _search_url(f"what is {body}")
+        step = self.current_step_or_none()
+        if step is None:
+            return "I'm not sure what 'that' refers to here. Could you be more specific?"
 
-        if self.recipe is None:
-            query = body.replace(" ", "+")
-            return f"https://www.google.com/search?q=what+is+{query}"
-        if body and body not in {"it", "that", "this"}:
-            query = body.replace(" ", "+")
-            return f"https://www.google.com/search?q=what+is+{query}"
-        step = self.get_current_step()
-        
         if step.methods:
             method = step.methods[0]
-            query = f"what is {method} in cooking".replace(" ", "+")
-            return f"https://www.google.com/search?q={query}"
+            query = f"what is {method} in cooking"
+            return _search_url(query)
         if step.tools:
             tool = step.tools[0]
-            query = f"what is a {tool}".replace(" ", "+")
-            return f"https://www.google.com/search?q={query}"
+            query = f"what is a {tool}"
+            return _search_url(query)
         if step.ingredients:
             ing_name = step.ingredients[-1]
-            query = f"what is {ing_name}".replace(" ", "+")
-            return f"https://www.google.com/search?q={query}"
+            query = f"what is {ing_name}"
+            return _search_url(query)
 
         
         return "I'm not sure what 'that' refers to here. Could you be more specific?"
 
 
+_COMMAND_HANDLERS: Dict[str, Callable[[RecipeBot], str]] = {
+    **dict.fromkeys(INGREDIENT_COMMANDS, RecipeBot.show_ingredients),
+    **dict.fromkeys(STEP_COMMANDS, RecipeBot.first_step),
+}
+
+# Insertion order is dispatch priority when several intents match.
+_NAVIGATION_HANDLERS: Dict[str, Callable[[RecipeBot], str]] = {
+    "NEXT": RecipeBot.next_step,
+    "BACK": RecipeBot.prev_step,
+    "REPEAT": RecipeBot.show_current_step,
+    "FIRST": RecipeBot.first_step,
+}
+
+_QUESTION_HANDLERS: Dict[str, Callable[[RecipeBot, str, str], str]] = {
+    "TIME": lambda bot, raw, norm: bot.answer_time_question(),
+    "TEMP": lambda bot, raw, norm: bot.answer_temp_question(),
+    "QUANTITY": RecipeBot.answer_quantity_question,
+    "VAGUE_HOW": lambda bot, raw, norm: bot.answer_vague_how_to(),
+}
+
+_QUERY_HANDLERS: Dict[str, Callable[[RecipeBot, str], str]] = {
+    "what is": RecipeBot.answer_what_is,
+    "how do i": RecipeBot.answer_how_to,
+    "how to": RecipeBot.answer_how_to,
+}
+
+_QUERY_RE = re.compile(
+    r"^(?P<prefix>"
+    + _alternation(sorted(_QUERY_HANDLERS, key=len, reverse=True))
+    + r") (?P<query>.+)$"
+)
+
+
 if __name__ == "__main__":
     use_speech_choice = input("Enable speech input? (y/n): ").strip().lower()
     use_speech = use_speech_choice.startswith("y")
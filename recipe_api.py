@@ -1,12 +1,20 @@
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
+import sys
+import tempfile
 import unicodedata
 from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import chain
 from typing import List, Dict, Optional, Tuple
 
 import json
 import re
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import argparse
 import nltk
@@ -23,8 +31,39 @@ except Exception:
     _nltk_pos_tag = None
     _nltk_word_tokenize = None
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Parsed recipes are cached and shared, so their fields cannot be rebound.
+# Frozen is shallow: the list and dict fields must not be mutated in place.
+# Frozen slotted dataclasses only unpickle reliably (the bot's shelve cache)
+# from 3.11 on.
+_DATACLASS_OPTIONS = {"frozen": True}
+if sys.version_info >= (3, 11):
+    _DATACLASS_OPTIONS["slots"] = True
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Ingredient:
     raw: str
     name: str
@@ -34,7 +73,7 @@ class Ingredient:
     preparation: Optional[str]
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Step:
     step_number: int
     description: str   
@@ -49,7 +88,7 @@ class Step:
     context: Dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Recipe:
     title: str
     url: str
@@ -462,6 +501,20 @@ TOOLS = [
 
 TOOLS = {u.lower() for u in TOOLS}
 
+
+def _build_vocab_automaton(vocab):
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for word in vocab:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+
+_TOOLS_AC = _build_vocab_automaton(TOOLS)
+
+
 PRIMARY_METHODS = [
     "bake",
     "boil",
@@ -598,6 +651,7 @@ def _build_cooking_verbs_from_wordnet() -> List[str]:
 
 
 COOKING_VERBS = set(PRIMARY_METHODS + OTHER_METHODS)
+MULTIWORD_METHODS = [v for v in PRIMARY_METHODS + OTHER_METHODS if " " in v]
 COOKING_VERBS.update(_build_cooking_verbs_from_wordnet())
 
 
@@ -609,19 +663,98 @@ for _tool in TOOLS:
 
 
 
+MAX_FETCH_WORKERS = 16
+FETCH_TIMEOUT = 10.0
+_FETCH_HEADERS = {"User-Agent": "recipe-api/1.0"}
+
+if httpx is not None:
+    _SESSION = httpx.Client(
+        http2=_HTTP2, follow_redirects=True, timeout=FETCH_TIMEOUT, headers=_FETCH_HEADERS
+    )
+else:
+    _SESSION = requests.Session()
+    _SESSION.headers.update(_FETCH_HEADERS)
+    _SESSION.mount("http://", HTTPAdapter(pool_maxsize=MAX_FETCH_WORKERS))
+    _SESSION.mount("https://", HTTPAdapter(pool_maxsize=MAX_FETCH_WORKERS))
+
+
+HTML_CACHE_ENABLED = os.environ.get("RECIPE_API_CACHE", "") not in ("", "0")
+HTML_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "recipe_api")
+
+
+def _html_cache_path(url: str) -> str:
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(HTML_CACHE_DIR, f"{key}.html")
+
+
+def _evict_cached_html(url: str) -> None:
+    if HTML_CACHE_ENABLED:
+        try:
+            os.remove(_html_cache_path(url))
+        except OSError:
+            pass
+
+
 def fetch_html(url: str) -> str:
-    resp = requests.get(url)
+    path = None
+    if HTML_CACHE_ENABLED:
+        path = _html_cache_path(url)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            pass
+
+    resp = _SESSION.get(url, timeout=FETCH_TIMEOUT)
     resp.raise_for_status()
-    return resp.text
+    html = resp.text
+    if path is not None:
+        tmp = None
+        try:
+            os.makedirs(HTML_CACHE_DIR, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=HTML_CACHE_DIR, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(html)
+            os.replace(tmp, path)
+        except OSError:
+            if tmp is not None:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+    return html
+
+
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = "lxml"
+except ImportError:
+    _HTML_PARSER = "html.parser"
+
+_JSON_LD_RE = re.compile(
+    r'<script\b[^>]*\btype\s*=\s*["\']?application/ld\+json["\']?[^>]*>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def _extract_json_ld(html: str) -> Optional[str]:
+    # The JSON-LD block is self-delimited, so skip building a DOM unless
+    # the page's markup defeats the regex.
+    match = _JSON_LD_RE.search(html)
+    if match is not None:
+        return match.group(1)
+    json_ld = BeautifulSoup(html, _HTML_PARSER).find("script", type="application/ld+json")
+    if json_ld is None:
+        return None
+    return json_ld.string
 
 
 def parse_allrecipes_basic(html: str) -> Dict[str, object]:
-    soup = BeautifulSoup(html, "html.parser")
-    json_ld = soup.find("script", type="application/ld+json")
-    if json_ld is None or not json_ld.string:
+    payload = _extract_json_ld(html)
+    if not payload:
         raise ValueError("Could not find recipe JSON-LD on page.")
 
-    data = json.loads(json_ld.string)
+    data = _json_loads(payload)
     if isinstance(data, list):
         recipe_obj = None
         for item in data:
@@ -656,6 +789,17 @@ def parse_allrecipes_basic(html: str) -> Dict[str, object]:
 
 
 
+FRACTION_UNICODE = frozenset({
+    "¼", "½", "¾",
+    "⅐", "⅑", "⅒",
+    "⅓", "⅔",
+    "⅕", "⅖", "⅗", "⅘",
+    "⅙", "⅚",
+    "⅛", "⅜", "⅝", "⅞",
+})
+
+
+@lru_cache(maxsize=512)
 def parse_quantity(token: str):
     token = token.strip()
     if len(token) == 1:
@@ -664,15 +808,6 @@ def parse_quantity(token: str):
         except (TypeError, ValueError):
             pass
 
-    FRACTION_UNICODE = {
-        "¼", "½", "¾",
-        "⅐", "⅑", "⅒",
-        "⅓", "⅔",
-        "⅕", "⅖", "⅗", "⅘",
-        "⅙", "⅚",
-        "⅛", "⅜", "⅝", "⅞",
-    }
-
     if len(token) > 1 and token[-1] in FRACTION_UNICODE:
         int_part = token[:-1]
         frac_char = token[-1]
@@ -698,6 +833,7 @@ def parse_quantity(token: str):
 
 
 
+@lru_cache(maxsize=4096)
 def parse_ingredient_line(line: str) -> Ingredient:
     raw = line.strip()
     tokens = raw.split()
@@ -767,58 +903,107 @@ def parse_ingredients(raw_ingredients: List[str]) -> List[Ingredient]:
 
 
 
+def iter_atomic_steps(step_text: str):
+    for part in sent_tokenize(step_text):
+        part = part.strip()
+        if part:
+            yield part
+
+
 def split_into_atomic_steps(step_text: str) -> List[str]:
-    parts = sent_tokenize(step_text)
-    return [p.strip() for p in parts if p.strip()]
+    return list(iter_atomic_steps(step_text))
+
+
+@lru_cache(maxsize=4096)
+def _word_pattern(word: str) -> re.Pattern:
+    return re.compile(r"\b" + re.escape(word) + r"\b")
 
 
 def find_items_in_text(text: str, vocab: List[str]) -> List[str]:
     text_lower = text.lower()
     found: List[str] = []
     for word in vocab:
-        if re.search(r"\b" + re.escape(word) + r"\b", text_lower):
+        # Plain substring check first; only a hit needs the word-boundary regex.
+        if word in text_lower and _word_pattern(word).search(text_lower):
             found.append(word)
     return found
 
 
+_DURATION_RE = re.compile(
+    r"\b(?:about|around|approximately|approx\.?)?\s*"
+    r"(\d+)\s*(?:(?:-|to)\s*(\d+)\s*)?"
+    r"(minutes?|minute|min|mins?|hours?|hour|hrs?|seconds?|second|secs?)\b",
+    flags=re.I,
+)
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _at_word_boundary(text: str, i: int) -> bool:
+    # Same test as the regex \b between text[i - 1] and text[i].
+    before = i > 0 and _is_word_char(text[i - 1])
+    after = i < len(text) and _is_word_char(text[i])
+    return before != after
+
+
+def _whole_word_hits(automaton, text_lower: str) -> List[str]:
+    hits: List[str] = []
+    for end, word in automaton.iter(text_lower):
+        if _at_word_boundary(text_lower, end - len(word) + 1) and _at_word_boundary(text_lower, end + 1):
+            hits.append(word)
+    return hits
+
+
+def find_tools_in_text(text: str, text_lower: Optional[str] = None) -> List[str]:
+    if _TOOLS_AC is None:
+        return find_items_in_text(text, TOOLS)
+    if text_lower is None:
+        text_lower = text.lower()
+    return _whole_word_hits(_TOOLS_AC, text_lower)
+
+
 def extract_time(text: str) -> Dict[str, str]:
-    text_stripped = text.strip()
-    range_match = re.search(
-        r"\b(?:about|around|approximately|approx\.?)?\s*"
-        r"(\d+)\s*(?:-|to)\s*(\d+)\s*"
-        r"(minutes?|minute|min|mins?|hours?|hour|hrs?|seconds?|second|secs?)\b",
-        text_stripped,
-        flags=re.I,
-    )
-    
-    if range_match:
-        return {"duration": range_match.group(0).strip()}
-
-    single_match = re.search(
-        r"\b(?:about|around|approximately|approx\.?)?\s*"
-        r"(\d+)\s*"
-        r"(minutes?|minute|min|mins?|hours?|hour|hrs?|seconds?|second|secs?)\b",
-        text_stripped,
-        flags=re.I,
-    )
-    if single_match:
-        return {"duration": single_match.group(0).strip()}
+    # One pass: a range ("10-15 minutes") anywhere wins over a single duration.
+    first_single = None
+    for match in _DURATION_RE.finditer(text.strip()):
+        if match.group(2) is not None:
+            return {"duration": match.group(0).strip()}
+        if first_single is None:
+            first_single = match
+
+    if first_single is not None:
+        return {"duration": first_single.group(0).strip()}
 
     return {}
 
 
 
-def extract_temperature(text: str) -> Dict[str, str]:
+_OVEN_TEMP_RE = re.compile(
+    r"(\d{2,3})\s*(?:°|degrees?\s*)?"
+    r"(F|C|Fahrenheit|Celsius)\b",
+    flags=re.I,
+)
+
+_HEAT_RE = re.compile(
+    r"\b("
+    r"low|"
+    r"medium(?:-|\s)low|"
+    r"medium(?:-|\s)high|"
+    r"medium|"
+    r"high"
+    r")\s+heat\b"
+)
+
+
+def extract_temperature(text: str, text_lower: Optional[str] = None) -> Dict[str, str]:
     info: Dict[str, str] = {}
     text_stripped = text.strip()
-    text_lower = text_stripped.lower()
+    if text_lower is None:
+        text_lower = text_stripped.lower()
 
-    oven_match = re.search(
-        r"(\d{2,3})\s*(?:°|degrees?\s*)?"
-        r"(F|C|Fahrenheit|Celsius)\b",
-        text_stripped,
-        flags=re.I,
-    )
+    oven_match = _OVEN_TEMP_RE.search(text_stripped)
     
     if oven_match:
         temp_str = oven_match.group(0).strip()
@@ -831,16 +1016,7 @@ def extract_temperature(text: str) -> Dict[str, str]:
         else:
             info["oven"] = temp_str
     
-    heat_match = re.search(
-        r"\b("
-        r"low|"
-        r"medium(?:-|\s)low|"
-        r"medium(?:-|\s)high|"
-        r"medium|"
-        r"high"
-        r")\s+heat\b",
-        text_lower,
-    )
+    heat_match = _HEAT_RE.search(text_lower)
     
     
     if heat_match:
@@ -869,72 +1045,75 @@ def _pos_tag(text: str):
         ) from e
 
 
-def extract_cooking_methods(text: str) -> List[str]:
+def extract_cooking_methods(text: str, text_lower: Optional[str] = None) -> List[str]:
     tagged = _pos_tag(text)
     methods: List[str] = []
+    seen = set()
 
     for token, tag in tagged:
         if tag.startswith("VB"):
             lemma = _lemmatize(token, "v")
-            if lemma in COOKING_VERBS:
-                methods.append(lemma)
+            if lemma in COOKING_VERBS and lemma not in seen:
+                seen.add(lemma)
+                methods.append(sys.intern(lemma))
 
 
-    text_lower = text.lower()
-    for verb in PRIMARY_METHODS + OTHER_METHODS:
-        if " " in verb and verb in text_lower:
+    if text_lower is None:
+        text_lower = text.lower()
+    for verb in MULTIWORD_METHODS:
+        if verb not in seen and verb in text_lower:
+            seen.add(verb)
             methods.append(verb)
-
-    seen = set()
-    unique: List[str] = []
-    
-    for m in methods:
-        if m not in seen:
-            seen.add(m)
-            unique.append(m)
-    return unique
+    return methods
 
 
-def extract_tools_from_text(text: str) -> List[str]:
+def extract_tools_from_text(text: str, text_lower: Optional[str] = None) -> List[str]:
     tagged = _pos_tag(text)
     tools: List[str] = []
+    seen = set()
 
     for token, tag in tagged:
         if tag.startswith("NN"):
-            lemma = _lemmatize(token, "n")
-            if lemma in TOOL_LEMMA_TO_CANONICAL:
-                tools.append(TOOL_LEMMA_TO_CANONICAL[lemma])
+            tool = TOOL_LEMMA_TO_CANONICAL.get(_lemmatize(token, "n"))
+            if tool is not None and tool not in seen:
+                seen.add(tool)
+                tools.append(tool)
+
+    for tool in find_tools_in_text(text, text_lower):
+        if tool not in seen:
+            seen.add(tool)
+            tools.append(tool)
+    return tools
 
-    tools.extend(find_items_in_text(text, TOOLS))
-    seen = set()
-    unique: List[str] = []
-    
-    for t in tools:
-        if t not in seen:
-            seen.add(t)
-            unique.append(t)
-    return unique
 
 
 
+_ALPHA_WORD_RE = re.compile(r"[a-zA-Z]+")
+_WORD_TOKEN_RE = re.compile(r"\w+")
+
+INGREDIENT_IGNORE_WORDS = {"of", "and", "or", "in", "with", "to", "for", "the", "a", "an"}
+
+
+@lru_cache(maxsize=1024)
+def _ingredient_terms(name: str) -> Tuple[str, ...]:
+    terms = [name]
+    for w in _ALPHA_WORD_RE.findall(name):
+        if w in INGREDIENT_IGNORE_WORDS or w in DESCRIPTOR_WORDS:
+            continue
+        terms.append(w)
+    return tuple(terms)
+
+
+@lru_cache(maxsize=1024)
+def _ingredient_patterns(name: str) -> Tuple[re.Pattern, ...]:
+    return tuple(_word_pattern(t) for t in _ingredient_terms(name))
+
 
 def ingredient_matches_step(ingredient_name: str, text_lower: str) -> bool:
     name = ingredient_name.lower().strip()
     if not name:
         return False
-    if re.search(r"\b" + re.escape(name) + r"\b", text_lower):
-        return True
-    words = re.findall(r"[a-zA-Z]+", name)
-    if not words:
-        return False
-
-    IGNORE_WORDS = {"of", "and", "or", "in", "with", "to", "for", "the", "a", "an"}
-    for w in words:
-        if w in IGNORE_WORDS or w in DESCRIPTOR_WORDS:
-            continue
-        if re.search(r"\b" + re.escape(w) + r"\b", text_lower):
-            return True
-    return False
+    return any(p.search(text_lower) for p in _ingredient_patterns(name))
 
 
 
@@ -943,25 +1122,44 @@ def ingredient_matches_step(ingredient_name: str, text_lower: str) -> bool:
 
 def build_steps(steps_raw: List[str], ingredients: List[Ingredient]) -> List[Step]:
     steps: List[Step] = []
-    ingredient_names = [ing.name.lower() for ing in ingredients]
+    ingredient_terms = [
+        (name, _ingredient_terms(name.strip()))
+        for name in (ing.name.lower() for ing in ingredients)
+        if name.strip()
+    ]
+    # One automaton over every name and significant word lets each step be
+    # scanned once. Without pyahocorasick, all-word-character terms are looked
+    # up in the step's token set and only the rest need a regex.
+    term_to_ingredients: Dict[str, List[int]] = {}
+    for i, (_, terms) in enumerate(ingredient_terms):
+        for t in dict.fromkeys(terms):
+            term_to_ingredients.setdefault(t, []).append(i)
+    all_terms = term_to_ingredients.keys()
+    automaton = _build_vocab_automaton(all_terms) if all_terms else None
+    single_word_terms = frozenset(t for t in all_terms if _WORD_TOKEN_RE.fullmatch(t))
+    other_terms = [t for t in all_terms if t not in single_word_terms]
     current_oven_temp: Optional[str] = None
     step_counter = 1
 
     for raw_step in steps_raw:
-        atomic_texts = split_into_atomic_steps(raw_step)
-        for text in atomic_texts:
-            text = text.strip()
-            if not text:
-                continue
+        for text in iter_atomic_steps(raw_step):
             text_lower = text.lower()
-            tools = extract_tools_from_text(text)
-            methods = extract_cooking_methods(text)
+            tools = extract_tools_from_text(text, text_lower)
+            methods = extract_cooking_methods(text, text_lower)
             time_info = extract_time(text)
-            temp_info = extract_temperature(text)
-            used_ingredients: List[str] = []
-            for name in ingredient_names:
-                if ingredient_matches_step(name, text_lower):
-                    used_ingredients.append(name)
+            temp_info = extract_temperature(text, text_lower)
+            if automaton is not None:
+                hits = set(_whole_word_hits(automaton, text_lower))
+            else:
+                hits = set(_WORD_TOKEN_RE.findall(text_lower))
+                hits.intersection_update(single_word_terms)
+                for term in other_terms:
+                    if term in text_lower and _word_pattern(term).search(text_lower):
+                        hits.add(term)
+            matched = set()
+            for term in hits:
+                matched.update(term_to_ingredients[term])
+            used_ingredients = [ingredient_terms[i][0] for i in sorted(matched)]
 
 
             if "oven" in temp_info:
@@ -982,7 +1180,7 @@ def build_steps(steps_raw: List[str], ingredients: List[Ingredient]) -> List[Ste
                 time=time_info,
                 temperature=temp_info,
                 action=action,
-                objects=used_ingredients,
+                objects=list(used_ingredients),
                 modifiers={"tools": ", ".join(tools)} if tools else {},
                 context=context,
             )
@@ -995,16 +1193,19 @@ def build_steps(steps_raw: List[str], ingredients: List[Ingredient]) -> List[Ste
 
 
 def collect_recipe_tools_and_methods(steps: List[Step]) -> Tuple[List[str], List[str]]:
-    tools_set = set()
-    methods_set = set()
-    for s in steps:
-        tools_set.update(s.tools)
-        methods_set.update(s.methods)
+    tools_set = set(chain.from_iterable(s.tools for s in steps))
+    methods_set = set(chain.from_iterable(s.methods for s in steps))
     return sorted(tools_set), sorted(methods_set)
 
+@lru_cache(maxsize=32)
 def parse_recipe_from_url(url: str) -> Recipe:
     html = fetch_html(url)
-    base = parse_allrecipes_basic(html)
+    try:
+        base = parse_allrecipes_basic(html)
+    except ValueError:
+        # don't keep serving a truncated or non-recipe page from the disk cache
+        _evict_cached_html(url)
+        raise
 
     ingredients = parse_ingredients(base["ingredients_raw"])
     steps = build_steps(base["steps_raw"], ingredients)
@@ -1019,6 +1220,12 @@ def parse_recipe_from_url(url: str) -> Recipe:
         steps=steps,
     )
 
+
+def parse_recipes_from_urls(urls: List[str], max_workers: int = MAX_FETCH_WORKERS) -> List[Recipe]:
+    # Fetching dominates and releases the GIL, so threads overlap the round-trips.
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls)))) as pool:
+        return list(pool.map(parse_recipe_from_url, urls))
+
 def _methods_for_json(methods: List[str]) -> Dict[str, List[str]]:
     primary: List[str] = []
     other: List[str] = []